@@ -10,11 +10,12 @@ for better coverage in arXiv-heavy domains. Normalizes nodes to OpenAlex IDs
 where possible. Includes:
 
 • Parallel mapping/fetching (--max-workers)
+• Batched OpenAlex work fetches (openalex_id:W1|W2|... filter, 50 per request)
 • Citation thresholding (--min-citations, --prune-below-threshold, --strict-threshold)
-• Connection pooling + retries (requests.Session + HTTPAdapter)
-• Polite rate limiter for OpenAlex (--oa-qps)
+• Keep-alive + retries (thread-local urllib3.PoolManager); optional HTTP/2 via httpx (--http2)
+• Polite token-bucket rate limiter for OpenAlex (--oa-qps)
 • Low-information title filtering to avoid noisy OA title searches
-• Persistent S2→OA mapping cache (--map-cache-path)
+• Persistent S2→OA mapping cache (--map-cache-path); orjson-backed cache I/O when installed
 • Logging (--verbose/--debug), per-layer progress (--progress), metrics JSON (--metrics-out)
 • Per-layer effective parallelism estimate and total wall-clock time
 • Optional GraphML and quick PNG layout (--graphml, --plot)
@@ -26,34 +27,38 @@ Outputs:
 - graph.json
 - [optional] graph.graphml
 - [optional] graph.png
-- .openalex_cache.json (OpenAlex work JSON cache)
+- .openalex_cache.sqlite (OpenAlex work cache; an old .openalex_cache.json is imported once)
 - .map_cache.json (S2→OA mapping cache)
 """
 
 import argparse
+import atexit
 import csv
+import io
 import json
 import os
 import re
+import sqlite3
 import sys
 import time
 import logging
+import math
+import threading
 from time import perf_counter
-from statistics import mean
+from bisect import bisect_left
 from collections import deque
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Set, Tuple, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import accumulate
+from operator import itemgetter
+from dataclasses import dataclass, fields
+from typing import ClassVar, Dict, List, Optional, Set, Tuple, Any
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from threading import Lock
 
 import requests
+import urllib3
 from requests.adapters import HTTPAdapter
-try:
-    from urllib3.util.retry import Retry
-except Exception:
-    class Retry:  # minimal shim
-        def __init__(self, total=3, backoff_factor=0.3, status_forcelist=None):
-            pass
+from urllib3.util.retry import Retry
 
 # Optional progress bars
 try:
@@ -61,6 +66,36 @@ try:
 except Exception:
     tqdm = None
 
+# Optional fast JSON (falls back to stdlib json)
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+# Optional numpy for latency percentiles
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None
+
+# Optional HTTP/2 transport (--http2)
+try:
+    import httpx  # type: ignore
+except Exception:
+    httpx = None
+
+# Optional JIT for the --plot layout (needs numpy)
+try:
+    from numba import njit, prange  # type: ignore
+except Exception:
+    njit = prange = None
+
+# Optional Bloom filter for the BFS "seen" sets (--bloom-seen)
+try:
+    from rbloom import Bloom  # type: ignore
+except Exception:
+    Bloom = None
+
 # ----------------------------------------------------------------------------- 
 # Constants & headers
 # -----------------------------------------------------------------------------
@@ -75,101 +110,319 @@ HEADERS_S2 = {"User-Agent": "ManyWorlds-ReferenceCrawler/1.4.1 (+https://example
 # -----------------------------------------------------------------------------
 _METRICS_LOCK = Lock()
 _METRICS = {
-    "requests": {
-        "openalex": {"ok": 0, "err": 0, "latencies": []},
-        "s2": {"ok": 0, "err": 0, "latencies": []},
+    "requests": {  # filled from the per-thread request stats by _request_metrics()
+        "openalex": {"ok": 0, "err": 0, "latency": None},
+        "s2": {"ok": 0, "err": 0, "latency": None},
     },
     "layers": [],  # engine, depth, totals, secs, rps, work_secs, eff_parallelism
+    "cache_loads": [],  # cache, path, bytes, entries, seconds (JSON cache files read at startup)
     "wall_clock_seconds": None,
 }
 
+class LatencyHistogram:
+    """
+    HDR-style latency histogram: log-spaced bins (2% apart) from 1 ms to 60 s,
+    so memory stays constant however many requests are recorded and quantiles
+    are accurate to ~2%.
+    """
+
+    MIN_S = 1e-3
+    GROWTH = 1.02
+    N_BINS = int(math.ceil(math.log(60.0 / MIN_S) / math.log(GROWTH))) + 2
+    _LOG_GROWTH = math.log(GROWTH)
+
+    def __init__(self):
+        self.counts = [0] * self.N_BINS
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, secs: float) -> None:
+        if secs <= self.MIN_S:
+            i = 0
+        else:
+            i = min(self.N_BINS - 1, 1 + int(math.log(secs / self.MIN_S) / self._LOG_GROWTH))
+        self.counts[i] += 1
+        self.total += 1
+        self.sum += secs
+        if secs > self.max:
+            self.max = secs
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def _bin_value(self, i: int) -> float:
+        # upper edge of bin i
+        return self.MIN_S * (self.GROWTH ** i)
+
+    def percentiles(self, ps: Tuple[float, ...]) -> List[Optional[float]]:
+        if not self.total:
+            return [None] * len(ps)
+        ranks = [max(1, math.ceil(p / 100.0 * self.total)) for p in ps]
+        if np is not None:
+            idx = np.searchsorted(np.cumsum(self.counts), ranks)
+        else:
+            cum = list(accumulate(self.counts))
+            idx = [bisect_left(cum, r) for r in ranks]
+        return [min(self._bin_value(int(i)), self.max) for i in idx]
+
+    def summary(self) -> dict:
+        p50, p95, p99 = self.percentiles((50, 95, 99))
+        return {
+            "count": self.total,
+            "mean": (self.sum / self.total) if self.total else None,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "max": self.max if self.total else None,
+        }
+
+class _RequestStats:
+    __slots__ = ("ok", "err", "hist")
+
+    def __init__(self):
+        self.ok = 0
+        self.err = 0
+        self.hist = LatencyHistogram()
+
+# Each worker thread records into its own stats (no shared lock on the request
+# path); the lock is only taken once per thread to register them for merging.
+_TLS_METRICS = threading.local()
+_THREAD_REQUEST_STATS: List[Dict[str, _RequestStats]] = []
+
+def _thread_stats(bucket: str) -> _RequestStats:
+    stats = getattr(_TLS_METRICS, "stats", None)
+    if stats is None:
+        stats = _TLS_METRICS.stats = {b: _RequestStats() for b in _METRICS["requests"]}
+        with _METRICS_LOCK:
+            _THREAD_REQUEST_STATS.append(stats)
+    return stats[bucket]
+
+def _request_metrics() -> Dict[str, dict]:
+    """Merge per-thread request stats into {bucket: {ok, err, latency summary}}."""
+    with _METRICS_LOCK:
+        per_thread = list(_THREAD_REQUEST_STATS)
+    out = {}
+    for bucket in _METRICS["requests"]:
+        hist = LatencyHistogram()
+        ok = err = 0
+        for stats in per_thread:
+            st = stats[bucket]
+            ok += st.ok
+            err += st.err
+            hist.merge(st.hist)
+        out[bucket] = {"ok": ok, "err": err, "latency": hist.summary()}
+    return out
+
+def _snapshot_metrics() -> dict:
+    """Detached copy of _METRICS with merged request stats (layer records are flat dicts)."""
+    with _METRICS_LOCK:
+        layers = [dict(L) for L in _METRICS["layers"]]
+        cache_loads = [dict(c) for c in _METRICS["cache_loads"]]
+        wall = _METRICS["wall_clock_seconds"]
+    return {"requests": _request_metrics(), "layers": layers, "cache_loads": cache_loads,
+            "wall_clock_seconds": wall}
+
 # ----------------------------------------------------------------------------- 
-# Connection pools (requests.Session) and rate limiter
+# HTTP connection pools (thread-local urllib3.PoolManager) and rate limiter
 # -----------------------------------------------------------------------------
-OA_SESSION = requests.Session()
-OA_SESSION.headers.update(HEADERS_OA)
-try:
-    OA_SESSION.mount(
-        "https://",
-        HTTPAdapter(
-            pool_connections=100,
-            pool_maxsize=100,
-            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
-        ),
+# One PoolManager per worker thread and API: each thread keeps its own keep-alive
+# connection, and threads never contend on a shared urllib3 pool lock. The hot
+# OpenAlex/S2 GETs go straight to urllib3; requests' per-call hooks, cookie jar
+# and prepare_request cost more than the send itself for small JSON bodies.
+_TLS_SESSIONS = threading.local()
+
+# Default query params for every OpenAlex request; main() sets "mailto" once and
+# safe_get/the httpx client merge them under the per-call params.
+OA_PARAMS: Dict[str, str] = {}
+
+def _new_pool(headers: dict, retry_total: int, retry_backoff: float) -> urllib3.PoolManager:
+    # urllib3 sends "Accept-Encoding: identity" unless told otherwise; ask for gzip/deflate
+    # like requests did (resp.data is decoded transparently)
+    return urllib3.PoolManager(
+        num_pools=1,
+        maxsize=1,
+        headers={**urllib3.util.make_headers(accept_encoding=True), **headers},
+        retries=Retry(total=retry_total, backoff_factor=retry_backoff,
+                      status_forcelist=[429, 502, 503, 504], raise_on_status=False),
     )
-except Exception:
-    OA_SESSION.mount("https://", HTTPAdapter(pool_connections=100, pool_maxsize=100))
 
-S2_SESSION = requests.Session()
-S2_SESSION.headers.update(HEADERS_S2)
-try:
-    S2_SESSION.mount(
-        "https://",
-        HTTPAdapter(
-            pool_connections=50,
-            pool_maxsize=50,
+def _get_oa_pool() -> urllib3.PoolManager:
+    pool = getattr(_TLS_SESSIONS, "oa", None)
+    if pool is None:
+        pool = _TLS_SESSIONS.oa = _new_pool(HEADERS_OA, retry_total=3, retry_backoff=0.3)
+    return pool
+
+def _get_s2_pool() -> urllib3.PoolManager:
+    pool = getattr(_TLS_SESSIONS, "s2", None)
+    if pool is None:
+        pool = _TLS_SESSIONS.s2 = _new_pool(HEADERS_S2, retry_total=2, retry_backoff=0.2)
+    return pool
+
+def _get_session() -> requests.Session:
+    """requests.Session fallback for GETs outside the openalex/s2 buckets."""
+    session = getattr(_TLS_SESSIONS, "session", None)
+    if session is None:
+        session = _TLS_SESSIONS.session = requests.Session()
+        session.headers.update(HEADERS_S2)
+        session.mount("https://", HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=1,
             max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504]),
-        ),
-    )
-except Exception:
-    S2_SESSION.mount("https://", HTTPAdapter(pool_connections=50, pool_maxsize=50))
+        ))
+    return session
+
+# Optional HTTP/2 clients (one per API), set by _enable_http2(). httpx.Client is
+# thread-safe and multiplexes concurrent worker requests over a single connection.
+_HTTP2_CLIENTS: Dict[str, Any] = {}
+_NET_ERRORS: Tuple[type, ...] = (
+    (urllib3.exceptions.HTTPError, requests.RequestException) + ((httpx.HTTPError,) if httpx else ())
+)
+
+def _enable_http2() -> bool:
+    """Route OpenAlex/S2 GETs through httpx HTTP/2 clients; False if httpx[http2] is missing."""
+    if httpx is None:
+        return False
+    try:
+        for bucket, headers, params in (("openalex", HEADERS_OA, OA_PARAMS), ("s2", HEADERS_S2, None)):
+            _HTTP2_CLIENTS[bucket] = httpx.Client(
+                http2=True,
+                headers=headers,
+                params=params,
+                timeout=30,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=100),
+            )
+    except ImportError:  # h2 not installed
+        _HTTP2_CLIENTS.clear()
+        return False
+    return True
 
 # Polite rate limiter for OpenAlex
-_RATELIMIT_LOCK = Lock()
-_LAST_CALL_TS = 0.0
 _OA_QPS = 3.0  # default, overridden via CLI
 
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills at `rate` tokens/s up to `capacity`.
+    The lock only guards the arithmetic; waiting happens outside it, so
+    concurrent workers can spend a burst of tokens without serializing.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = max(rate, 0.1)
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.last = perf_counter()
+        self.lock = Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = perf_counter()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                sleep_for = (1.0 - self.tokens) / self.rate
+            time.sleep(sleep_for)
+
+def _make_oa_limiter(qps: float) -> TokenBucket:
+    return TokenBucket(rate=qps, capacity=max(1, int(qps * 2)))
+
+_OA_LIMITER = _make_oa_limiter(_OA_QPS)
+
 def _rate_limit(bucket: Optional[str]) -> None:
-    """Simple limiter: enforce ~QPS for OpenAlex requests."""
+    """Enforce ~QPS for OpenAlex requests (bursts up to 2s worth of tokens)."""
     if bucket != "openalex":
         return
-    global _LAST_CALL_TS
-    with _RATELIMIT_LOCK:
-        now = perf_counter()
-        wait = max(0.0, (1.0 / max(_OA_QPS, 0.1)) - (now - _LAST_CALL_TS))
-        if wait > 0:
-            time.sleep(wait)
-            now = perf_counter()
-        _LAST_CALL_TS = now
+    _OA_LIMITER.acquire()
 
 # ----------------------------------------------------------------------------- 
 # Utilities
 # -----------------------------------------------------------------------------
+DOI_PAT = re.compile(r"^10\.\d{4,9}/\S+$", re.IGNORECASE)
+OA_URL_PAT = re.compile(r"openalex\.org/(W\d+)", re.IGNORECASE)
+OA_ID_PAT = re.compile(r"^W\d+$", re.IGNORECASE)
+S2_URL_PAT = re.compile(r"/paper/[^/]+/([0-9a-fA-F]{16,}|[A-Za-z0-9\-]+)$")
+S2_HEX_ID_PAT = re.compile(r"^[0-9a-fA-F]{16,}$")
+S2_ID_PAT = re.compile(r"^[A-Za-z0-9\-]{10,}$")
+WORD_PAT = re.compile(r"\w+")
+
 def is_doi(s: str) -> bool:
-    return bool(re.match(r"^10\.\d{4,9}/\S+$", s.strip(), re.IGNORECASE))
+    return bool(DOI_PAT.match(s.strip()))
 
 def extract_openalex_id(s: str) -> Optional[str]:
     s = s.strip()
-    m = re.search(r"openalex\.org/(W\d+)", s, re.IGNORECASE)
+    m = OA_URL_PAT.search(s)
     if m:
         return m.group(1)
-    if re.match(r"^W\d+$", s, re.IGNORECASE):
+    if OA_ID_PAT.match(s):
         return s
     return None
 
 def extract_s2_id(s: str) -> Optional[str]:
     s = s.strip()
-    m = re.search(r"/paper/[^/]+/([0-9a-fA-F]{16,}|[A-Za-z0-9\-]+)$", s)
+    m = S2_URL_PAT.search(s)
     if m:
         return m.group(1)
-    if re.match(r"^[0-9a-fA-F]{16,}$", s) or re.match(r"^[A-Za-z0-9\-]{10,}$", s):
+    if S2_HEX_ID_PAT.match(s) or S2_ID_PAT.match(s):
         return s
     return None
 
+def _oa_short(url: Optional[str]) -> Optional[str]:
+    """https://openalex.org/W123 -> W123 (single pass; passes short IDs through)."""
+    return url.rpartition("/")[2] if url else url
+
 def normalize_doi(doi: Optional[str]) -> Optional[str]:
+    """Bare, lowercased DOI (DOIs are case-insensitive, so this is also the cache key)."""
     if not doi:
         return None
-    doi = doi.strip()
-    if doi.lower().startswith("https://doi.org/"):
+    doi = doi.strip().lower()
+    if doi.startswith("https://doi.org/"):
         doi = doi[len("https://doi.org/"):]
     return doi
 
-def _percentile(vals: List[float], p: float) -> Optional[float]:
-    if not vals:
-        return None
-    vals = sorted(vals)
-    k = max(0, min(len(vals)-1, int(round((p/100.0)*(len(vals)-1)))))
-    return float(vals[k])
+def _json_loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+def _json_dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON."""
+    return orjson.dumps(obj) if orjson is not None else _JSON_ENCODER.encode(obj).encode("utf-8")
+
+def _load_json_file(path: str) -> Any:
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
+def _load_json_cache(name: str, path: str) -> Any:
+    """_load_json_file for a cache file, recording its size and parse time in the metrics."""
+    t0 = perf_counter()
+    nbytes = os.stat(path).st_size
+    data = _load_json_file(path)
+    with _METRICS_LOCK:
+        _METRICS["cache_loads"].append({
+            "cache": name,
+            "path": path,
+            "bytes": nbytes,
+            "entries": len(data),
+            "seconds": perf_counter() - t0,
+        })
+    return data
+
+def _dump_json_atomic(obj: Any, path: str, indent: bool = False) -> None:
+    """Write JSON to a sibling temp file, then os.replace() it over path."""
+    tmp = f"{path}.tmp"
+    if orjson is not None:
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0))
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2 if indent else None)
+    os.replace(tmp, path)
 
 # Low-information title filter (avoid noisy OA title searches)
 GENERIC_TITLE_PAT = re.compile(
@@ -187,15 +440,19 @@ GENERIC_TITLE_PAT = re.compile(
 )
 ARXIV_ID_PAT = re.compile(r"(?i)^\s*(?:hep-(?:th|ph)|gr-qc|astro-ph|cond-mat)/\d{7}\s*$")
 
+@lru_cache(maxsize=100_000)  # journal-style non-titles recur across a citation graph
 def is_low_info_title(t: Optional[str]) -> bool:
     if not t:
         return True
-    if ARXIV_ID_PAT.match(t.strip()):
+    n_words = len(WORD_PAT.findall(t))
+    if n_words < 3:
         return True
-    words = re.findall(r"\w+", t)
-    if GENERIC_TITLE_PAT.search(t) and len(words) <= 4:
+    # The venue/arXiv-ID patterns only decide 3–4 word titles; skip them otherwise
+    if n_words > 4:
+        return False
+    if ARXIV_ID_PAT.match(t.strip()):
         return True
-    return len(words) < 3
+    return bool(GENERIC_TITLE_PAT.search(t))
 
 # ----------------------------------------------------------------------------- 
 # HTTP helpers with instrumentation
@@ -210,51 +467,76 @@ def safe_get(
     logger: logging.Logger = None,
 ) -> Any:
     last_err = None
-    session = OA_SESSION if bucket == "openalex" else S2_SESSION
+    client = _HTTP2_CLIENTS.get(bucket)
+    pool = None
+    if client is None:
+        if bucket == "openalex":
+            pool = _get_oa_pool()
+            if OA_PARAMS:
+                params = {**OA_PARAMS, **params} if params else OA_PARAMS
+        elif bucket == "s2":
+            pool = _get_s2_pool()
+        else:
+            client = _get_session()
     for attempt in range(retries):
         t0 = perf_counter()
         try:
             _rate_limit(bucket)
-            resp = session.get(url, params=params, headers=headers, timeout=30)
+            if pool is not None:
+                resp = pool.request("GET", url, fields=params, headers=headers, timeout=30)
+                status, body = resp.status, resp.data
+            else:
+                resp = client.get(url, params=params, headers=headers, timeout=30)
+                status, body = resp.status_code, resp.content
             dt = perf_counter() - t0
-            ok = (resp.status_code == 200)
-            with _METRICS_LOCK:
-                if bucket:
-                    (_METRICS["requests"][bucket]["ok" if ok else "err"]) += 1
-                    _METRICS["requests"][bucket]["latencies"].append(dt)
+            ok = (status == 200)
+            if ok:
+                # A truncated/garbled 200 body is an error to retry, as requests' resp.json() was
+                try:
+                    data = _json_loads(body)
+                except ValueError as e:
+                    ok, last_err = False, e
+            if bucket:
+                st = _thread_stats(bucket)
+                if ok:
+                    st.ok += 1
+                else:
+                    st.err += 1
+                st.hist.record(dt)
             if ok:
                 if logger and logger.isEnabledFor(logging.DEBUG):
-                    logger.debug(f"GET {bucket or ''} {url} {resp.status_code} in {dt:.3f}s")
-                return resp.json()
-            if resp.status_code in (429, 503, 502, 504):
+                    logger.debug(f"GET {bucket or ''} {url} {status} in {dt:.3f}s")
+                return data
+            if status in (429, 503, 502, 504):
                 if logger and logger.isEnabledFor(logging.INFO):
-                    logger.info(f"Backoff {bucket or ''} {resp.status_code} (attempt {attempt+1})")
+                    logger.info(f"Backoff {bucket or ''} {status} (attempt {attempt+1})")
                 time.sleep((backoff ** attempt) + 0.5)
                 continue
-            last_err = RuntimeError(f"HTTP {resp.status_code}: {resp.text[:200]}")
-        except requests.RequestException as e:
+            if status != 200:
+                last_err = RuntimeError(f"HTTP {status}: {body[:200].decode('utf-8', 'replace')}")
+        except _NET_ERRORS as e:
             dt = perf_counter() - t0
-            with _METRICS_LOCK:
-                if bucket:
-                    _METRICS["requests"][bucket]["err"] += 1
-                    _METRICS["requests"][bucket]["latencies"].append(dt)
+            if bucket:
+                st = _thread_stats(bucket)
+                st.err += 1
+                st.hist.record(dt)
             last_err = e
         time.sleep(backoff ** attempt)
     raise last_err if last_err else RuntimeError("Unknown network error")
 
 def oa_get(path: str, params: dict = None, email: Optional[str] = None, logger: logging.Logger = None) -> Any:
-    params = dict(params or {})
-    if email:
-        params["mailto"] = email
-    return safe_get(f"{OPENALEX_BASE}{path}", params=params, headers=HEADERS_OA, bucket="openalex", logger=logger)
+    # mailto normally comes from OA_PARAMS in safe_get; only copy for a different address
+    if email and email != OA_PARAMS.get("mailto"):
+        params = {**(params or {}), "mailto": email}
+    return safe_get(f"{OPENALEX_BASE}{path}", params=params, bucket="openalex", logger=logger)
 
 def s2_get(path: str, params: dict = None, logger: logging.Logger = None) -> Any:
-    return safe_get(f"{SEMANTIC_SCHOLAR_BASE}{path}", params=params, headers=HEADERS_S2, bucket="s2", logger=logger)
+    return safe_get(f"{SEMANTIC_SCHOLAR_BASE}{path}", params=params, bucket="s2", logger=logger)
 
 # ----------------------------------------------------------------------------- 
 # Data model
 # -----------------------------------------------------------------------------
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WorkNode:
     openalex_id: Optional[str]
     doi: Optional[str]
@@ -268,15 +550,29 @@ class WorkNode:
     source: Optional[str] = None
     s2_paper_id: Optional[str] = None
 
+    _field_names: ClassVar[Tuple[str, ...]]  # set right after the class body
+
+    def to_row(self) -> tuple:
+        """Field values in declaration order (the CSV column order after 'key')."""
+        return (
+            self.openalex_id, self.doi, self.title, self.publication_year, self.host_venue,
+            self.type, self.authors, self.cited_by_count, self.is_retracted, self.source,
+            self.s2_paper_id,
+        )
+
+    def to_dict(self) -> dict:
+        """Shallow field dict; unlike dataclasses.asdict, no per-call deepcopy or field introspection."""
+        return dict(zip(self._field_names, self.to_row()))
+
     @staticmethod
-    def from_openalex_json(j: dict, source: str = "openalex") -> "WorkNode":
-        host = j.get("host_venue") or {}
+    def from_openalex_json(j: dict, source: str = "openalex", s2_paper_id: Optional[str] = None) -> "WorkNode":
+        host = j.get("host_venue") or (j.get("primary_location") or {}).get("source") or {}
         authorships = j.get("authorships") or []
         authors = ", ".join(
             [a.get("author", {}).get("display_name", "") for a in authorships if a.get("author")]
         ) or None
         return WorkNode(
-            openalex_id=(j.get("id") or "").split("/")[-1] if j.get("id") else None,
+            openalex_id=_oa_short(j.get("id")) or None,
             doi=j.get("doi") or None,
             title=j.get("title") or None,
             publication_year=j.get("publication_year") or None,
@@ -286,39 +582,276 @@ class WorkNode:
             cited_by_count=j.get("cited_by_count") or 0,
             is_retracted=j.get("is_retracted") or False,
             source=source,
+            s2_paper_id=s2_paper_id,
         )
 
+WorkNode._field_names = tuple(f.name for f in fields(WorkNode))
+
 # ----------------------------------------------------------------------------- 
 # Mapping cache (S2 -> OA) — persistent across runs
 # -----------------------------------------------------------------------------
 _MAP_CACHE: Dict[str, Optional[str]] = {}
 _MAP_CACHE_LOCK = Lock()
 _MAP_CACHE_PATH = ".map_cache.json"
+_MAP_CACHE_DIRTY = False
+_MAP_CACHE_LAST_FLUSH = 0.0
+_MAP_CACHE_FLUSH_SECS = 30.0
 
 def _load_map_cache(path: str):
-    global _MAP_CACHE
+    global _MAP_CACHE, _MAP_CACHE_LAST_FLUSH
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            _MAP_CACHE = json.load(f)
+        _MAP_CACHE = _load_json_cache("map", path)
     except Exception:
         _MAP_CACHE = {}
+    _MAP_CACHE_LAST_FLUSH = time.monotonic()
 
 def _save_map_cache(path: str):
     try:
         with _MAP_CACHE_LOCK:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(_MAP_CACHE, f, ensure_ascii=False, indent=2)
+            _dump_json_atomic(_MAP_CACHE, path, indent=True)
     except Exception:
         pass
 
+def _flush_map_cache(path: str, force: bool = False):
+    """Persist the mapping cache if it changed, at most every _MAP_CACHE_FLUSH_SECS unless forced."""
+    global _MAP_CACHE_DIRTY, _MAP_CACHE_LAST_FLUSH
+    with _MAP_CACHE_LOCK:
+        now = time.monotonic()
+        if not _MAP_CACHE_DIRTY or (not force and now - _MAP_CACHE_LAST_FLUSH <= _MAP_CACHE_FLUSH_SECS):
+            return
+        _MAP_CACHE_DIRTY = False
+        _MAP_CACHE_LAST_FLUSH = now
+    _save_map_cache(path)
+
 def _map_cache_get(key: str) -> Optional[Optional[str]]:
     with _MAP_CACHE_LOCK:
         return _MAP_CACHE.get(key)
 
 def _map_cache_set(key: str, val: Optional[str], path: str):
+    global _MAP_CACHE_DIRTY
     with _MAP_CACHE_LOCK:
         _MAP_CACHE[key] = val
-    _save_map_cache(path)
+        _MAP_CACHE_DIRTY = True
+    _flush_map_cache(path)
+
+def _map_cache_set_many(items: Dict[str, Optional[str]], path: str):
+    global _MAP_CACHE_DIRTY
+    if not items:
+        return
+    with _MAP_CACHE_LOCK:
+        _MAP_CACHE.update(items)
+        _MAP_CACHE_DIRTY = True
+    _flush_map_cache(path)
+
+# ----------------------------------------------------------------------------- 
+# OpenAlex work cache — persistent across runs
+# -----------------------------------------------------------------------------
+# Works live in SQLite (table works(oa_id, json)) so lookups and inserts are
+# O(1) on disk instead of loading/re-dumping one monolithic JSON file.
+_OA_DB: Optional[sqlite3.Connection] = None
+_OA_CACHE_LOCK = Lock()  # serializes use of the shared connection
+
+def _oa_db_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".sqlite"
+
+def _encode_work(work: dict) -> bytes:
+    return orjson.dumps(work) if orjson is not None else json.dumps(work).encode("utf-8")
+
+def _load_oa_cache(path: Optional[str]):
+    """Open (or create) the work cache; '' / None keeps it in memory for this run only."""
+    global _OA_DB
+    db_path = _oa_db_path(path) if path else ":memory:"
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS works (oa_id TEXT PRIMARY KEY, json BLOB NOT NULL)")
+
+    # One-time import of a pre-SQLite JSON cache sitting next to the database
+    legacy = os.path.splitext(path)[0] + ".json" if path else None
+    if legacy and os.path.exists(legacy) and conn.execute("SELECT 1 FROM works LIMIT 1").fetchone() is None:
+        try:
+            old = _load_json_cache("openalex_legacy", legacy)
+            conn.execute("BEGIN")
+            conn.executemany("INSERT OR REPLACE INTO works VALUES (?, ?)",
+                             ((k, _encode_work(v)) for k, v in old.items()))
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+
+    with _OA_CACHE_LOCK:
+        if _OA_DB is not None:
+            _OA_DB.close()
+        _OA_DB = conn
+
+def _close_oa_cache():
+    global _OA_DB
+    with _OA_CACHE_LOCK:
+        if _OA_DB is not None:
+            _OA_DB.close()
+            _OA_DB = None
+
+def _oa_cache_get(oid: str) -> Optional[dict]:
+    with _OA_CACHE_LOCK:
+        if _OA_DB is None:
+            return None
+        row = _OA_DB.execute("SELECT json FROM works WHERE oa_id = ?", (oid,)).fetchone()
+    return _json_loads(row[0]) if row else None
+
+def _oa_cache_has_many(oids: List[str]) -> Set[str]:
+    found: Set[str] = set()
+    with _OA_CACHE_LOCK:
+        if _OA_DB is None:
+            return found
+        for i in range(0, len(oids), 500):  # stay under SQLite's bound-variable limit
+            chunk = oids[i:i + 500]
+            rows = _OA_DB.execute(
+                f"SELECT oa_id FROM works WHERE oa_id IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            found.update(r[0] for r in rows)
+    return found
+
+def _oa_cache_put_many(works: Dict[str, dict]):
+    if not works:
+        return
+    rows = [(k, _encode_work(v)) for k, v in works.items()]
+    with _OA_CACHE_LOCK:
+        if _OA_DB is not None:
+            _OA_DB.executemany("INSERT OR REPLACE INTO works VALUES (?, ?)", rows)
+
+# In-flight fetches ("singleflight"): concurrent requests for the same work
+# wait on the first caller's Future instead of issuing duplicate HTTP calls.
+_OA_INFLIGHT: Dict[str, Future] = {}
+_OA_INFLIGHT_LOCK = Lock()
+
+def _claim_inflight(oids: List[str]) -> Tuple[Dict[str, Future], List[Future]]:
+    """Return (futures this caller now owns, futures owned by other callers)."""
+    owned: Dict[str, Future] = {}
+    waiting: List[Future] = []
+    with _OA_INFLIGHT_LOCK:
+        for oid in oids:
+            fut = _OA_INFLIGHT.get(oid)
+            if fut is None:
+                fut = _OA_INFLIGHT[oid] = Future()
+                owned[oid] = fut
+            else:
+                waiting.append(fut)
+    return owned, waiting
+
+def _settle_inflight(
+    owned: Dict[str, Future],
+    fetched: Optional[Dict[str, dict]] = None,
+    err: Optional[BaseException] = None,
+):
+    """Release owned IDs and resolve their futures from `fetched`, else the cache."""
+    with _OA_INFLIGHT_LOCK:
+        for oid in owned:
+            _OA_INFLIGHT.pop(oid, None)
+    for oid, fut in owned.items():
+        d = fetched.get(oid) if fetched else None
+        if d is None:
+            d = _oa_cache_get(oid)
+        if d is not None:
+            fut.set_result(d)
+        else:
+            fut.set_exception(err or LookupError(f"OpenAlex work {oid} unavailable"))
+
+def oa_get_or_fetch(oid: str, email: Optional[str], logger: logging.Logger = None) -> dict:
+    d = _oa_cache_get(oid)
+    if d is not None:
+        return d
+    owned, waiting = _claim_inflight([oid])
+    if waiting:
+        return waiting[0].result()
+    fetched: Dict[str, dict] = {}
+    try:
+        # re-check: another caller may have finished between our miss and the claim
+        if _oa_cache_get(oid) is None:
+            fetched[oid] = oa_fetch_work(oid, email, logger=logger)
+            _oa_cache_put_many(fetched)
+    except BaseException as e:
+        _settle_inflight(owned, fetched, e)
+        raise
+    _settle_inflight(owned, fetched)
+    return owned[oid].result()
+
+def oa_get_or_fetch_many(
+    oids: List[str],
+    email: Optional[str],
+    logger: logging.Logger,
+    progress: bool = False,
+    desc: str = "OA works",
+    executor: Optional[ThreadPoolExecutor] = None,
+    min_citations: Optional[int] = None,
+    wait_inflight: bool = True,
+    pruned: Optional[Set[str]] = None,
+) -> float:
+    """
+    Batch-fetch uncached works into the work cache. Chunks run concurrently on
+    `executor` when given; IDs already being fetched elsewhere are awaited, not
+    refetched (or just skipped with wait_inflight=False, which speculative
+    callers running on a pool worker must use: the owner's chunks may be queued
+    behind them on that same pool). With min_citations, OpenAlex filters
+    server-side and IDs it doesn't return are treated as pruned (no per-ID fallback);
+    pass a `pruned` set to record them and skip them on later calls.
+    Returns summed seconds spent on the network.
+    """
+    oids = list(dict.fromkeys(oids))
+    if pruned:
+        oids = [oid for oid in oids if oid not in pruned]
+    cached = _oa_cache_has_many(oids)
+    missing = [oid for oid in oids if oid not in cached]
+    if not missing:
+        return 0.0
+    owned, waiting = _claim_inflight(missing)
+    claimed = list(owned)
+    chunks = [claimed[i:i + OA_BATCH_SIZE] for i in range(0, len(claimed), OA_BATCH_SIZE)]
+
+    def fetch_chunk(chunk: List[str]) -> float:
+        t0 = perf_counter()
+        found: Dict[str, dict] = {}
+        try:
+            batch_failed = False
+            try:
+                found = oa_fetch_works_batch(chunk, email, logger=logger, min_citations=min_citations)
+            except Exception as e:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"{desc}: batch fetch of {len(chunk)} works failed: {e}")
+                found = {}
+                batch_failed = True
+            _oa_cache_put_many(found)
+            if min_citations and pruned is not None and not batch_failed:
+                pruned.update(oid for oid in chunk if oid not in found)
+            # Merged/redirected IDs don't come back from the filter; fetch those one by one
+            for oid in chunk:
+                if oid in found or min_citations:
+                    continue
+                try:
+                    w = found[oid] = oa_fetch_work(oid, email, logger=logger)
+                    _oa_cache_put_many({oid: w})
+                except Exception as e:
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(f"{desc}: OA work {oid} failed: {e}")
+        finally:
+            _settle_inflight({oid: owned[oid] for oid in chunk}, found)
+        return perf_counter() - t0
+
+    if executor is not None and len(chunks) > 1:
+        iterator = as_completed([executor.submit(fetch_chunk, c) for c in chunks])
+        if progress and tqdm is not None:
+            iterator = tqdm(iterator, total=len(chunks), desc=desc, leave=False)
+        work_secs = sum(fut.result() for fut in iterator)
+    else:
+        iterator = chunks
+        if progress and tqdm is not None and len(chunks) > 1:
+            iterator = tqdm(chunks, desc=desc, leave=False)
+        work_secs = sum(fetch_chunk(c) for c in iterator)
+
+    for fut in (waiting if wait_inflight else ()):
+        fut.exception()  # wait; failures just leave the ID uncached
+    return work_secs
+
+atexit.register(_close_oa_cache)
 
 # ----------------------------------------------------------------------------- 
 # Resolvers (OA + S2)
@@ -328,20 +861,66 @@ def oa_resolve_seed(ref: str, email: Optional[str], logger: logging.Logger = Non
     if w:
         return w
     if is_doi(ref):
-        data = oa_get("/works", {"filter": f"doi:{ref}", "per_page": 1}, email=email, logger=logger)
+        data = oa_get("/works", {"filter": f"doi:{normalize_doi(ref)}", "per_page": 1}, email=email, logger=logger)
         results = data.get("results") or []
         if not results:
             raise ValueError(f"No OpenAlex work found for DOI: {ref}")
-        return results[0]["id"].split("/")[-1]
+        return _oa_short(results[0]["id"])
     data = oa_get("/works", {"search": ref, "per_page": 5, "sort": "relevance_score:desc"}, email=email, logger=logger)
     results = data.get("results") or []
     if not results:
         raise ValueError(f"No OpenAlex work found for title search: {ref}")
     results.sort(key=lambda r: (r.get("relevance_score", 0), r.get("cited_by_count", 0)), reverse=True)
-    return results[0]["id"].split("/")[-1]
+    return _oa_short(results[0]["id"])
+
+# Only the fields WorkNode and the crawlers read (host_venue is gone from the
+# current API; primary_location.source carries the venue now)
+OA_WORK_SELECT = (
+    "id,doi,title,publication_year,primary_location,type,authorships,"
+    "cited_by_count,is_retracted,referenced_works"
+)
 
 def oa_fetch_work(openalex_id: str, email: Optional[str], logger: logging.Logger = None) -> dict:
-    return oa_get(f"/works/{openalex_id}", {}, email=email, logger=logger)
+    return oa_get(f"/works/{openalex_id}", {"select": OA_WORK_SELECT}, email=email, logger=logger)
+
+OA_BATCH_SIZE = 50  # max OR-joined values OpenAlex accepts in one filter
+
+def oa_fetch_works_batch(
+    ids: List[str],
+    email: Optional[str],
+    logger: logging.Logger = None,
+    min_citations: Optional[int] = None,
+) -> Dict[str, dict]:
+    """
+    Fetch many works with the OR-joined `openalex_id:W1|W2|...` filter, 50 IDs per call.
+    Returns {short OA id: work json}. IDs OpenAlex doesn't return (e.g., merged works) are
+    simply absent; callers decide whether to fall back to oa_fetch_work.
+    min_citations: if set, OpenAlex drops works with fewer citations server-side.
+    """
+    out: Dict[str, dict] = {}
+    extra = f",cited_by_count:>{min_citations - 1}" if min_citations else ""
+    for i in range(0, len(ids), OA_BATCH_SIZE):
+        chunk = ids[i:i + OA_BATCH_SIZE]
+        cursor = "*"
+        got = 0
+        while cursor:
+            data = oa_get("/works", {
+                "filter": "openalex_id:" + "|".join(chunk) + extra,
+                "select": OA_WORK_SELECT,
+                "per-page": OA_BATCH_SIZE,
+                "cursor": cursor,
+            }, email=email, logger=logger)
+            results = data.get("results") or []
+            for w in results:
+                wid = _oa_short(w.get("id"))
+                if wid:
+                    out[wid] = w
+            got += len(results)
+            meta = data.get("meta") or {}
+            if not results or got >= (meta.get("count") or 0):
+                break
+            cursor = meta.get("next_cursor")
+    return out
 
 def s2_find_seed(ref: str, email: Optional[str], logger: logging.Logger = None) -> Optional[str]:
     s2id = extract_s2_id(ref)
@@ -393,7 +972,63 @@ def s2_fetch_refs(paper_id: str, logger: logging.Logger = None) -> List[dict]:
     }, logger=logger)
     return (j or {}).get("references") or []
 
-def map_s2_ref_to_openalex(ref: dict, email: Optional[str], logger: logging.Logger, map_cache_path: str) -> Optional[str]:
+def oa_resolve_dois_batch(dois: List[str], email: Optional[str], logger: logging.Logger = None) -> Dict[str, Optional[str]]:
+    """
+    Resolve DOIs to OA IDs with the OR-joined `doi:d1|d2|...` filter, 50 per call.
+    Pages with `cursor` since several works can share a DOI. Returns {normalized
+    doi: OA id or None}; DOIs whose batch failed or came back incomplete are left
+    out so the caller can retry them one by one.
+    """
+    out: Dict[str, Optional[str]] = {}
+    # ',' and '|' would break the filter syntax; leave those to the per-DOI path
+    dois = [d for d in dict.fromkeys(map(normalize_doi, dois)) if d and "," not in d and "|" not in d]
+    for i in range(0, len(dois), OA_BATCH_SIZE):
+        chunk = dois[i:i + OA_BATCH_SIZE]
+        hits: Dict[str, str] = {}
+        cursor = "*"
+        got = 0
+        complete = False
+        try:
+            while cursor:
+                data = oa_get("/works", {
+                    "filter": "doi:" + "|".join(chunk),
+                    "per-page": OA_BATCH_SIZE,
+                    "select": "id,doi",
+                    "cursor": cursor,
+                }, email=email, logger=logger)
+                results = data.get("results") or []
+                for w in results:
+                    wdoi = normalize_doi(w.get("doi"))
+                    if wdoi and w.get("id"):
+                        hits[wdoi] = _oa_short(w["id"])
+                got += len(results)
+                meta = data.get("meta") or {}
+                if not results or got >= (meta.get("count") or 0):
+                    complete = True
+                    break
+                cursor = meta.get("next_cursor")
+        except Exception as e:
+            if logger and logger.isEnabledFor(logging.INFO):
+                logger.info(f"DOI batch of {len(chunk)} failed: {e}")
+        for doi in chunk:
+            if doi in hits:
+                out[doi] = hits[doi]
+            elif complete:
+                out[doi] = None
+    return out
+
+def map_s2_ref_to_openalex(
+    ref: dict,
+    email: Optional[str],
+    logger: logging.Logger,
+    map_cache_path: str,
+    doi_hits: Optional[Dict[str, Optional[str]]] = None,
+) -> Optional[str]:
+    """
+    Map one S2 reference to an OA ID (DOI → ArXiv → S2 → title, cached).
+    doi_hits: optional {normalized doi: OA id or None} from oa_resolve_dois_batch;
+    DOIs present there are answered without another request.
+    """
     ext = ref.get("externalIds") or {}
     doi = normalize_doi(ext.get("DOI"))
     arx = ext.get("ArXiv")
@@ -406,10 +1041,12 @@ def map_s2_ref_to_openalex(ref: dict, email: Optional[str], logger: logging.Logg
         cached = _map_cache_get(key)
         if cached is not None:
             return cached
+        if doi_hits is not None and doi in doi_hits:
+            return doi_hits[doi]
         try:
             data = oa_get("/works", {"filter": f"doi:{doi}", "per_page": 1}, email=email, logger=logger)
             res = data.get("results") or []
-            out = res[0]["id"].split("/")[-1] if res else None
+            out = _oa_short(res[0]["id"]) if res else None
             _map_cache_set(key, out, map_cache_path)
             return out
         except Exception:
@@ -424,7 +1061,7 @@ def map_s2_ref_to_openalex(ref: dict, email: Optional[str], logger: logging.Logg
         try:
             data = oa_get("/works", {"search": arx, "per_page": 3}, email=email, logger=logger)
             res = data.get("results") or []
-            out = res[0]["id"].split("/")[-1] if res else None
+            out = _oa_short(res[0]["id"]) if res else None
             _map_cache_set(key, out, map_cache_path)
             return out
         except Exception:
@@ -446,7 +1083,7 @@ def map_s2_ref_to_openalex(ref: dict, email: Optional[str], logger: logging.Logg
         try:
             data = oa_get("/works", {"search": title, "per_page": 3}, email=email, logger=logger)
             res = data.get("results") or []
-            out = res[0]["id"].split("/")[-1] if res else None
+            out = _oa_short(res[0]["id"]) if res else None
             _map_cache_set(tkey, out, map_cache_path)
             if s2id:
                 _map_cache_set(f"S2:{s2id}", out, map_cache_path)
@@ -476,6 +1113,25 @@ def passes_threshold_from_oa_json(work_json: dict, min_citations: int, strict: b
 # ----------------------------------------------------------------------------- 
 # Crawlers (OpenAlex-only + S2-backed), with parallelization and instrumentation
 # -----------------------------------------------------------------------------
+def _oa_child_ids(work: dict) -> List[str]:
+    """Short W-IDs of a work's referenced_works."""
+    refs = work.get("referenced_works") or []
+    return [sid for r in refs if isinstance(r, str) for sid in (_oa_short(r),) if sid.startswith("W")]
+
+BLOOM_ERROR_RATE = 0.001
+
+def _new_seen(first: str, bloom_capacity: int = 0) -> Any:
+    """Frontier dedup set: exact set() by default, ~1.8 bytes/key Bloom filter if asked.
+
+    A Bloom false positive only means a node is not expanded; nodes and edges
+    still live in real containers.
+    """
+    if bloom_capacity > 0 and Bloom is not None:
+        seen = Bloom(bloom_capacity, BLOOM_ERROR_RATE)
+        seen.add(first)
+        return seen
+    return {first}
+
 def crawl_references_openalex(
     seed_id: str,
     depth: int,
@@ -488,83 +1144,69 @@ def crawl_references_openalex(
     strict_threshold: bool,
     logger: logging.Logger,
     progress: bool,
+    bloom_capacity: int = 0,
 ) -> Tuple[Dict[str, WorkNode], List[Tuple[str, str]]]:
 
     nodes: Dict[str, WorkNode] = {}
     edges: List[Tuple[str, str]] = []
 
-    cache_oa: Dict[str, dict] = {}
-    if cache_path and os.path.exists(cache_path):
-        try:
-            with open(cache_path, "r", encoding="utf-8") as f:
-                cache_oa = json.load(f)
-        except Exception:
-            cache_oa = {}
-    cache_lock = Lock()
-
-    def oa_get_or_fetch(oid: str) -> dict:
-        with cache_lock:
-            d = cache_oa.get(oid)
-        if d is not None:
-            return d
-        d = oa_fetch_work(oid, email, logger=logger)
-        with cache_lock:
-            cache_oa[oid] = d
-            if cache_path:
-                with open(cache_path, "w", encoding="utf-8") as f:
-                    json.dump(cache_oa, f)
-        return d
+    _load_oa_cache(cache_path)
 
     # seed
-    d0 = oa_get_or_fetch(seed_id)
+    d0 = oa_get_or_fetch(seed_id, email, logger=logger)
     nodes[seed_id] = WorkNode.from_openalex_json(d0, source="openalex")
 
-    seen: Set[str] = {seed_id}
-    q = deque([(seed_id, 0)])
+    seen = _new_seen(seed_id, bloom_capacity)
+    q = deque([(seed_id, d0, 0)])
 
-    while q:
-        cur, d = q.popleft()
-        if d >= depth:
-            continue
-
-        cur_data = oa_get_or_fetch(cur)
-        refs = cur_data.get("referenced_works") or []
-        child_ids = [r.split("/")[-1] for r in refs if isinstance(r, str) and r.split("/")[-1].startswith("W")]
-        if not child_ids:
-            if delay > 0:
-                time.sleep(delay)
-            continue
+    # Pruned refs are dropped entirely, so let OpenAlex discard them server-side
+    server_min_citations = min_citations if (prune_below and min_citations > 0) else None
+    # IDs OpenAlex filtered out; never cached, so remembered here to avoid re-requesting them
+    server_pruned: Set[str] = set()
 
-        layer_start = perf_counter()
-        n_total = len(child_ids)
-        n_kept = n_pruned = n_expanded = 0
-        work_secs_sum = 0.0
+    # Speculative child fetches for queued parents, keyed by parent ID
+    prefetched: Dict[str, Future] = {}
 
-        def timed_fetch(oid: str):
-            t0 = perf_counter()
-            data = oa_get_or_fetch(oid)
-            return data, (perf_counter() - t0)
+    # One pool for the whole crawl: keeps worker threads (and their keep-alive
+    # connections) warm across parents instead of rebuilding them per layer.
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        while q:
+            cur, cur_data, d = q.popleft()
+            if d >= depth:
+                continue
 
-        with ThreadPoolExecutor(max_workers=max_workers) as ex:
-            future_map = {ex.submit(timed_fetch, cid): cid for cid in child_ids}
-            iterator = as_completed(future_map)
-            if progress and tqdm is not None:
-                iterator = tqdm(iterator, total=n_total, desc=f"OA L{d} refs", leave=False)
+            child_ids = _oa_child_ids(cur_data)
+            if not child_ids:
+                if delay > 0:
+                    time.sleep(delay)
+                continue
 
-            to_expand: List[str] = []
-            for fut in iterator:
-                cid = future_map[fut]
-                try:
-                    cjson, elapsed = fut.result()
-                except Exception as e:
-                    if logger.isEnabledFor(logging.INFO):
-                        logger.info(f"[L{d}] OA child {cid} failed: {e}")
+            layer_start = perf_counter()
+            n_total = len(child_ids)
+            n_kept = n_pruned = n_expanded = 0
+            # Wait for the speculative fetch if it already started (it never blocks on
+            # other owners, so it finishes); the regular pass then picks up whatever it
+            # skipped, or everything if it was cancelled before starting.
+            work_secs_sum = 0.0
+            pf = prefetched.pop(cur, None)
+            if pf is not None and not pf.cancel() and pf.exception() is None:
+                work_secs_sum = pf.result()
+            work_secs_sum += oa_get_or_fetch_many(child_ids, email, logger, progress=progress,
+                                                  desc=f"OA L{d} refs", executor=ex,
+                                                  min_citations=server_min_citations,
+                                                  pruned=server_pruned)
+
+            to_expand: List[Tuple[str, dict]] = []
+            for cid in child_ids:
+                cjson = _oa_cache_get(cid)
+                if cjson is None:
+                    if server_min_citations:
+                        n_pruned += 1  # filtered out by OpenAlex
                     continue
 
-                work_secs_sum += elapsed
                 if logger.isEnabledFor(logging.DEBUG):
                     title = (cjson.get("title") or "")[:60]
-                    logger.debug(f"[L{d}] OA child {cid} fetched in {elapsed:.3f}s — {title}")
+                    logger.debug(f"[L{d}] OA child {cid} — {title}")
 
                 keep = passes_threshold_from_oa_json(cjson, min_citations, strict_threshold)
                 if not keep and prune_below:
@@ -579,33 +1221,42 @@ def crawl_references_openalex(
 
                 if keep and cid not in seen:
                     n_expanded += 1
-                    to_expand.append(cid)
-
-        for cid in to_expand:
-            seen.add(cid)
-            q.append((cid, d + 1))
+                    to_expand.append((cid, cjson))
+
+            for cid, cjson in to_expand:
+                seen.add(cid)
+                q.append((cid, cjson, d + 1))
+                # Start fetching its refs now so the pool never idles while earlier parents drain.
+                # No executor here: chunks run inside this worker instead of waiting on the pool.
+                if d + 1 < depth:
+                    grandkids = _oa_child_ids(cjson)
+                    if grandkids:
+                        prefetched[cid] = ex.submit(oa_get_or_fetch_many, grandkids, email, logger,
+                                                    desc=f"OA L{d + 1} prefetch",
+                                                    min_citations=server_min_citations,
+                                                    wait_inflight=False, pruned=server_pruned)
+
+            layer_dt = perf_counter() - layer_start
+            eff_parallelism = (work_secs_sum / layer_dt) if layer_dt > 0 else None
+            with _METRICS_LOCK:
+                _METRICS["layers"].append({
+                    "engine": "openalex",
+                    "depth": d,
+                    "total_refs": n_total,
+                    "kept": n_kept,
+                    "pruned": n_pruned,
+                    "expanded": n_expanded,
+                    "seconds": layer_dt,
+                    "refs_per_sec": (n_total / layer_dt) if layer_dt > 0 else None,
+                    "work_secs": work_secs_sum,
+                    "eff_parallelism": eff_parallelism,
+                })
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"[OA L{d}] refs={n_total} kept={n_kept} pruned={n_pruned} expanded={n_expanded} "
+                            f"in {layer_dt:.2f}s (eff_parallelism≈{eff_parallelism and f'{eff_parallelism:.1f}' or 'n/a'})")
 
-        layer_dt = perf_counter() - layer_start
-        eff_parallelism = (work_secs_sum / layer_dt) if layer_dt > 0 else None
-        with _METRICS_LOCK:
-            _METRICS["layers"].append({
-                "engine": "openalex",
-                "depth": d,
-                "total_refs": n_total,
-                "kept": n_kept,
-                "pruned": n_pruned,
-                "expanded": n_expanded,
-                "seconds": layer_dt,
-                "refs_per_sec": (n_total / layer_dt) if layer_dt > 0 else None,
-                "work_secs": work_secs_sum,
-                "eff_parallelism": eff_parallelism,
-            })
-        if logger.isEnabledFor(logging.INFO):
-            logger.info(f"[OA L{d}] refs={n_total} kept={n_kept} pruned={n_pruned} expanded={n_expanded} "
-                        f"in {layer_dt:.2f}s (eff_parallelism≈{eff_parallelism and f'{eff_parallelism:.1f}' or 'n/a'})")
-
-        if delay > 0:
-            time.sleep(delay)
+            if delay > 0:
+                time.sleep(delay)
 
     return nodes, edges
 
@@ -625,371 +1276,538 @@ def crawl_references_via_s2(
     logger: logging.Logger,
     progress: bool,
     map_cache_path: str,
+    bloom_capacity: int = 0,
 ) -> Tuple[Dict[str, WorkNode], List[Tuple[str, str]]]:
 
     nodes: Dict[str, WorkNode] = {}
     edges: List[Tuple[str, str]] = []
 
-    cache_oa: Dict[str, dict] = {}
-    if cache_path and os.path.exists(cache_path):
-        try:
-            with open(cache_path, "r", encoding="utf-8") as f:
-                cache_oa = json.load(f)
-        except Exception:
-            cache_oa = {}
-    cache_lock = Lock()
-
-    def oa_get_or_fetch(oid: str) -> dict:
-        with cache_lock:
-            d = cache_oa.get(oid)
-        if d is not None:
-            return d
-        d = oa_fetch_work(oid, email, logger=logger)
-        with cache_lock:
-            cache_oa[oid] = d
-            if cache_path:
-                with open(cache_path, "w", encoding="utf-8") as f:
-                    json.dump(cache_oa, f)
-        return d
+    _load_oa_cache(cache_path)
 
     # Seed node
-    seed_json = oa_get_or_fetch(seed_oa_id)
-    seed_node = WorkNode.from_openalex_json(seed_json, source="mixed")
-    seed_node.s2_paper_id = seed_s2_id
-    nodes[seed_oa_id] = seed_node
+    seed_json = oa_get_or_fetch(seed_oa_id, email, logger=logger)
+    nodes[seed_oa_id] = WorkNode.from_openalex_json(seed_json, source="mixed", s2_paper_id=seed_s2_id)
 
-    seen_keys: Set[str] = {seed_oa_id}  # keys can be OA IDs or S2 synthetic keys
+    seen_keys = _new_seen(seed_oa_id, bloom_capacity)  # keys can be OA IDs or S2 synthetic keys
     q = deque([(seed_oa_id, seed_s2_id, 0)])
 
-    while q:
-        cur_key, cur_s2, d = q.popleft()
-        if d >= depth:
-            continue
+    # Shared by every layer's mapping workers and batched OA fetches
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        while q:
+            cur_key, cur_s2, d = q.popleft()
+            if d >= depth:
+                continue
 
-        try:
-            s2_refs = s2_fetch_refs(cur_s2, logger=logger) if cur_s2 else []
-        except Exception as e:
-            if logger.isEnabledFor(logging.WARNING):
-                logger.warning(f"[warn] S2 ref fetch failed for {cur_s2}: {e}")
-            s2_refs = []
-
-        layer_start = perf_counter()
-        n_total = len(s2_refs)
-        n_kept = n_pruned = n_expanded = 0
-        work_secs_sum = 0.0
-
-        def worker(ref: dict):
-            t0 = perf_counter()
-            title = (ref.get("title") or "")[:80]
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug(f"[L{d}] map S2→OA start — {title}")
-
-            cited_oa = map_s2_ref_to_openalex(ref, email, logger=logger, map_cache_path=map_cache_path)
-            cited_s2 = ref.get("paperId") or (ref.get("externalIds") or {}).get("CorpusId")
-
-            # Mapped to OA?
-            if cited_oa:
-                try:
-                    cjson = oa_get_or_fetch(cited_oa)
-                except Exception as e:
-                    if logger.isEnabledFor(logging.INFO):
-                        logger.info(f"[L{d}] OA fetch failed for {cited_oa}: {e}")
-                    cjson = None
-                    cited_oa = None
+            try:
+                s2_refs = s2_fetch_refs(cur_s2, logger=logger) if cur_s2 else []
+            except Exception as e:
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(f"[warn] S2 ref fetch failed for {cur_s2}: {e}")
+                s2_refs = []
+
+            layer_start = perf_counter()
+            n_total = len(s2_refs)
+            n_kept = n_pruned = n_expanded = 0
+            work_secs_sum = 0.0
+
+            # Resolve every uncached DOI in this layer up front, 50 per OA request;
+            # only refs still unresolved fall through to per-item ArXiv/title lookups.
+            layer_dois = []
+            for ref in s2_refs:
+                doi = normalize_doi((ref.get("externalIds") or {}).get("DOI"))
+                if doi and _map_cache_get(f"DOI:{doi}") is None:
+                    layer_dois.append(doi)
+            doi_hits: Dict[str, Optional[str]] = {}
+            if layer_dois:
+                t0 = perf_counter()
+                doi_hits = oa_resolve_dois_batch(layer_dois, email, logger=logger)
+                work_secs_sum += perf_counter() - t0
+                _map_cache_set_many(
+                    {f"DOI:{doi}": doi_hits[doi] for doi in layer_dois if doi in doi_hits},
+                    map_cache_path,
+                )
+
+            def worker(ref: dict):
+                t0 = perf_counter()
+                title = (ref.get("title") or "")[:80]
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"[L{d}] map S2→OA start — {title}")
+
+                cited_oa = map_s2_ref_to_openalex(ref, email, logger=logger, map_cache_path=map_cache_path,
+                                                  doi_hits=doi_hits)
+                cited_s2 = ref.get("paperId") or (ref.get("externalIds") or {}).get("CorpusId")
 
                 dt = perf_counter() - t0
                 if logger.isEnabledFor(logging.DEBUG):
                     logger.debug(f"[L{d}] map S2→OA done in {dt:.3f}s — OA:{cited_oa or '∅'} — {title}")
-
-                if cited_oa and cjson:
-                    keep = passes_threshold_from_oa_json(cjson, min_citations, strict_threshold)
-                    if not keep and prune_below:
-                        # prune entirely
-                        return (None, None, None, True, False, False, None, None, dt)
-                    # expand if meets threshold
-                    expand = keep
-                    return (cited_oa, cjson, cited_s2, True, True, expand, None, None, dt)
-
-            # Unmapped to OA
-            dt = perf_counter() - t0
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug(f"[L{d}] map S2→OA done in {dt:.3f}s — OA:∅ — {title}")
-
-            if strict_threshold:
-                return (None, None, None, False, False, False, None, None, dt)
-            if not keep_unmapped:
-                return (None, None, None, False, False, False, None, None, dt)
-
-            # keep as S2-only node with synthetic key (carry title/year for node enrichment)
-            synth_key = f"S2:{cited_s2}" if cited_s2 else f"S2-TITLE:{title}"
-            s2_title = ref.get("title")
-            s2_year = ref.get("year")
-            return (synth_key, None, cited_s2, False, True, True, s2_title, s2_year, dt)
-
-        keep_targets: List[
-            Tuple[str, Optional[dict], Optional[str], bool, bool, bool, Optional[str], Optional[int], float]
-        ] = []
-        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+                return ref, cited_oa, cited_s2, dt
+
+            def classify(ref: dict, cited_oa: Optional[str], cited_s2: Optional[str], dt: float):
+                # Mapped to OA?
+                if cited_oa:
+                    cjson = _oa_cache_get(cited_oa)
+                    if cjson:
+                        keep = passes_threshold_from_oa_json(cjson, min_citations, strict_threshold)
+                        if not keep and prune_below:
+                            # prune entirely
+                            return (None, None, None, True, False, False, None, None, dt)
+                        # expand if meets threshold
+                        expand = keep
+                        return (cited_oa, cjson, cited_s2, True, True, expand, None, None, dt)
+
+                # Unmapped to OA
+                if strict_threshold:
+                    return (None, None, None, False, False, False, None, None, dt)
+                if not keep_unmapped:
+                    return (None, None, None, False, False, False, None, None, dt)
+
+                # keep as S2-only node with synthetic key (carry title/year for node enrichment)
+                title = (ref.get("title") or "")[:80]
+                synth_key = f"S2:{cited_s2}" if cited_s2 else f"S2-TITLE:{title}"
+                s2_title = ref.get("title")
+                s2_year = ref.get("year")
+                return (synth_key, None, cited_s2, False, True, True, s2_title, s2_year, dt)
+
+            mapped: List[Tuple[dict, Optional[str], Optional[str], float]] = []
             futures = [ex.submit(worker, r) for r in s2_refs]
             iterator = as_completed(futures)
             if progress and tqdm is not None:
                 iterator = tqdm(iterator, total=n_total, desc=f"S2 L{d} refs", leave=False)
             for fut in iterator:
-                res = fut.result()
-                keep_targets.append(res)  # append all, including pruned, so we can count n_pruned
+                mapped.append(fut.result())
 
-        for target_key, oa_json, next_s2, mapped_to_oa, keep, expand, s2_title, s2_year, elapsed in keep_targets:
-            work_secs_sum += elapsed
+            # One batched OA fetch for every mapped target in this layer
+            work_secs_sum += oa_get_or_fetch_many([m[1] for m in mapped if m[1]], email, logger,
+                                                  progress=progress, desc=f"S2 L{d} OA works", executor=ex)
 
-            if not keep:
-                n_pruned += 1
-                continue
+            # classify all, including pruned, so we can count n_pruned
+            keep_targets: List[
+                Tuple[str, Optional[dict], Optional[str], bool, bool, bool, Optional[str], Optional[int], float]
+            ] = [classify(*m) for m in mapped]
 
-            # Create/update node
-            if mapped_to_oa and oa_json is not None:
-                if target_key not in nodes:
-                    node = WorkNode.from_openalex_json(oa_json, source="mixed")
-                    node.s2_paper_id = next_s2
-                    nodes[target_key] = node
-            else:
-                # S2-only node (synthetic)
-                if target_key not in nodes:
-                    nodes[target_key] = WorkNode(
-                        openalex_id=None,
-                        doi=None,
-                        title=s2_title,
-                        publication_year=s2_year,
-                        host_venue=None,
-                        type=None,
-                        authors=None,
-                        cited_by_count=None,
-                        is_retracted=None,
-                        source="s2",
-                        s2_paper_id=next_s2
-                    )
-
-            # Add edge
-            if target_key is not None:
-                edges.append((cur_key, target_key))
-                n_kept += 1
+            for target_key, oa_json, next_s2, mapped_to_oa, keep, expand, s2_title, s2_year, elapsed in keep_targets:
+                work_secs_sum += elapsed
 
-                if expand and target_key not in seen_keys:
-                    n_expanded += 1
-                    seen_keys.add(target_key)
-                    q.append((target_key, next_s2 or "", d + 1))
+                if not keep:
+                    n_pruned += 1
+                    continue
 
-        layer_dt = perf_counter() - layer_start
-        eff_parallelism = (work_secs_sum / layer_dt) if layer_dt > 0 else None
-        with _METRICS_LOCK:
-            _METRICS["layers"].append({
-                "engine": "s2",
-                "depth": d,
-                "total_refs": n_total,
-                "kept": n_kept,
-                "pruned": n_pruned,
-                "expanded": n_expanded,
-                "seconds": layer_dt,
-                "refs_per_sec": (n_total / layer_dt) if layer_dt > 0 else None,
-                "work_secs": work_secs_sum,
-                "eff_parallelism": eff_parallelism,
-            })
-        if logger.isEnabledFor(logging.INFO):
-            logger.info(f"[S2 L{d}] refs={n_total} kept={n_kept} pruned={n_pruned} expanded={n_expanded} "
-                        f"in {layer_dt:.2f}s (eff_parallelism≈{eff_parallelism and f'{eff_parallelism:.1f}' or 'n/a'})")
-
-        if delay > 0:
-            time.sleep(delay)
+                # Create/update node
+                if mapped_to_oa and oa_json is not None:
+                    if target_key not in nodes:
+                        nodes[target_key] = WorkNode.from_openalex_json(oa_json, source="mixed",
+                                                                        s2_paper_id=next_s2)
+                else:
+                    # S2-only node (synthetic)
+                    if target_key not in nodes:
+                        nodes[target_key] = WorkNode(
+                            openalex_id=None,
+                            doi=None,
+                            title=s2_title,
+                            publication_year=s2_year,
+                            host_venue=None,
+                            type=None,
+                            authors=None,
+                            cited_by_count=None,
+                            is_retracted=None,
+                            source="s2",
+                            s2_paper_id=next_s2
+                        )
+
+                # Add edge
+                if target_key is not None:
+                    edges.append((cur_key, target_key))
+                    n_kept += 1
+
+                    if expand and target_key not in seen_keys:
+                        n_expanded += 1
+                        seen_keys.add(target_key)
+                        q.append((target_key, next_s2 or "", d + 1))
+
+            layer_dt = perf_counter() - layer_start
+            eff_parallelism = (work_secs_sum / layer_dt) if layer_dt > 0 else None
+            with _METRICS_LOCK:
+                _METRICS["layers"].append({
+                    "engine": "s2",
+                    "depth": d,
+                    "total_refs": n_total,
+                    "kept": n_kept,
+                    "pruned": n_pruned,
+                    "expanded": n_expanded,
+                    "seconds": layer_dt,
+                    "refs_per_sec": (n_total / layer_dt) if layer_dt > 0 else None,
+                    "work_secs": work_secs_sum,
+                    "eff_parallelism": eff_parallelism,
+                })
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"[S2 L{d}] refs={n_total} kept={n_kept} pruned={n_pruned} expanded={n_expanded} "
+                            f"in {layer_dt:.2f}s (eff_parallelism≈{eff_parallelism and f'{eff_parallelism:.1f}' or 'n/a'})")
+
+            _flush_map_cache(map_cache_path)
+            if delay > 0:
+                time.sleep(delay)
 
+    _flush_map_cache(map_cache_path, force=True)
     return nodes, edges
 
 # ----------------------------------------------------------------------------- 
 # Exporters
 # -----------------------------------------------------------------------------
+WRITE_BUFFER_SIZE = 1 << 20  # output files: one write() syscall per MiB instead of per 8 KiB
+
 def write_csv_nodes(nodes: Dict[str, WorkNode], out_path: str):
-    items = list(nodes.items())
-    items.sort(key=lambda kv: str(kv[0]))
-    fieldnames = [
-        "key", "openalex_id", "doi", "title", "publication_year", "host_venue",
-        "type", "authors", "cited_by_count", "is_retracted", "source", "s2_paper_id"
-    ]
-    with open(out_path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for key, n in items:
-            row = asdict(n)
-            row = {"key": key, **row}
-            w.writerow(row)
+    items = sorted(nodes.items(), key=itemgetter(0))  # keys are always str
+    with open(out_path, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+        w = csv.writer(f)
+        w.writerow(("key", *WorkNode._field_names))
+        w.writerows((key, *n.to_row()) for key, n in items)
+
+EDGE_CSV_CHUNK = 1 << 16  # edges formatted per write()
 
 def write_csv_edges(edges: List[Tuple[str, str]], out_path: str):
-    with open(out_path, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["source_key", "target_key"])
-        w.writerows(edges)
+    # Rows are formatted directly; csv only handles a chunk whose keys need quoting
+    # (S2-TITLE:<title> keys). Same bytes either way, \r\n terminator included.
+    with open(out_path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(b"source_key,target_key\r\n")
+        for i in range(0, len(edges), EDGE_CSV_CHUNK):
+            chunk = edges[i:i + EDGE_CSV_CHUNK]
+            text = "".join([f"{s},{t}\r\n" for s, t in chunk])
+            n = len(chunk)
+            if text.count(",") != n or text.count("\n") != n or text.count("\r") != n or '"' in text:
+                buf = io.StringIO()
+                csv.writer(buf).writerows(chunk)
+                text = buf.getvalue()
+            f.write(text.encode("utf-8"))
+
+def _write_json_graph(f, node_records, edges: List[Tuple[str, str]]) -> None:
+    """Stream {"nodes": [...], "edges": [...]} to binary f, one compact record per line."""
+    def write_array(records) -> None:
+        sep = b"\n"
+        for rec in records:
+            f.write(sep)
+            f.write(_json_dumps(rec))
+            sep = b",\n"
+        f.write(b"\n]")
+
+    f.write(b'{"nodes":[')
+    write_array(node_records)
+    f.write(b',"edges":[')
+    write_array({"source": s, "target": t} for s, t in edges)
+    f.write(b"}\n")
 
 def write_json(nodes: Dict[str, WorkNode], edges: List[Tuple[str, str]], out_path: str):
-    items = list(nodes.items())
-    items.sort(key=lambda kv: str(kv[0]))
-    data = {
-        "nodes": [{"key": k, **asdict(v)} for k, v in items],
-        "edges": [{"source": s, "target": t} for s, t in edges],
-    }
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    """Streamed graph JSON; no whole-graph dict."""
+    items = sorted(nodes.items(), key=itemgetter(0))  # keys are always str
+    with open(out_path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        _write_json_graph(f, ({"key": k, **v.to_dict()} for k, v in items), edges)
+
+def write_nodes_csv_and_json(nodes: Dict[str, WorkNode], edges: List[Tuple[str, str]],
+                             node_csv: str, json_out: str):
+    """write_csv_nodes + write_json in one sorted pass: each node's row is built once for both."""
+    items = sorted(nodes.items(), key=itemgetter(0))
+    names = ("key", *WorkNode._field_names)
+    with open(node_csv, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as fc, \
+            open(json_out, "wb", buffering=WRITE_BUFFER_SIZE) as fj:
+        w = csv.writer(fc)
+        w.writerow(names)
+
+        def node_records():
+            for k, n in items:
+                row = (k, *n.to_row())
+                w.writerow(row)
+                yield dict(zip(names, row))
+
+        _write_json_graph(fj, node_records(), edges)
+
+PARQUET_INT_FIELDS = {"publication_year", "cited_by_count"}
+PARQUET_BOOL_FIELDS = {"is_retracted"}
+
+def write_parquet(nodes: Dict[str, WorkNode], edges: List[Tuple[str, str]],
+                  nodes_path: str, edges_path: str) -> bool:
+    """Nodes and edges as two zstd Parquet tables (same columns as the CSVs); False without pyarrow."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("pyarrow not installed; skipping Parquet output.", file=sys.stderr)
+        return False
+    items = sorted(nodes.items(), key=itemgetter(0))
+    rows = [n.to_row() for _, n in items]
+    columns = {"key": pa.array([k for k, _ in items], type=pa.string())}
+    for i, name in enumerate(WorkNode._field_names):
+        typ = (pa.int64() if name in PARQUET_INT_FIELDS
+               else pa.bool_() if name in PARQUET_BOOL_FIELDS else pa.string())
+        columns[name] = pa.array([r[i] for r in rows], type=typ)
+    pq.write_table(pa.table(columns), nodes_path, compression="zstd", use_dictionary=True)
+    # Keys repeat across edges, so dictionary encoding does most of the work here
+    edge_table = pa.table({
+        "source_key": pa.array([s for s, _ in edges], type=pa.string()),
+        "target_key": pa.array([t for _, t in edges], type=pa.string()),
+    })
+    pq.write_table(edge_table, edges_path, compression="zstd", use_dictionary=True)
+    return True
+
+# --- GraphML attribute schema: which attributes exist and what types they should be ---
+GRAPHML_STRING_KEYS: Tuple[str, ...] = (
+    "id", "openalex_id", "s2_id", "doi", "title", "host_venue",
+    "type", "authors", "source",
+)
+GRAPHML_INT_KEYS: Tuple[str, ...] = ("publication_year", "cited_by_count")
+GRAPHML_BOOL_KEYS: Tuple[str, ...] = ("is_retracted",)
+
+GRAPHML_EDGE_STRING_KEYS: Tuple[str, ...] = ()           # if you ever add string edge attrs
+GRAPHML_EDGE_INT_KEYS: Tuple[str, ...] = ("depth",)      # current schema
+GRAPHML_EDGE_BOOL_KEYS: Tuple[str, ...] = ()
+
+def _as_str(v):
+    if v is None:
+        return ""
+    # forbid lists/dicts in GraphML
+    if isinstance(v, (list, dict)):
+        return ""
+    return str(v)
+
+def _as_int(v):
+    if v is None or v == "":
+        return -1
+    try:
+        return int(v)
+    except Exception:
+        # last-resort: if it can't be parsed, mark as -1
+        return -1
+
+def _as_bool(v):
+    if v is None:
+        return False
+    if isinstance(v, bool):
+        return v
+    # accept "true"/"false", "1"/"0"
+    s = str(v).strip().lower()
+    if s in {"1", "true", "yes", "y"}:
+        return True
+    if s in {"0", "false", "no", "n"}:
+        return False
+    return False
+
+def _clean_node_attrs(raw):
+    """
+    Return (node_id, attrs) with safe GraphML-friendly values.
+    If node id can't be determined, return (None, None) to skip.
+    """
+    g = raw.get
+    # pick a stable id
+    nid = g("id") or g("openalex_id") or (("S2:" + raw["s2_id"]) if g("s2_id") else None)
+    if not nid:
+        return None, None
+
+    # Strings only when present; ints/bools always, so each attribute has one type
+    # across nodes (_as_int(None) == -1, _as_bool(None) is False).
+    # Unknown keys and complex types are dropped to avoid type conflicts.
+    attrs = {k: _as_str(raw[k]) for k in GRAPHML_STRING_KEYS if k in raw}
+    attrs.update(zip(GRAPHML_INT_KEYS, map(_as_int, map(g, GRAPHML_INT_KEYS))))
+    attrs.update(zip(GRAPHML_BOOL_KEYS, map(_as_bool, map(g, GRAPHML_BOOL_KEYS))))
+    return nid, attrs
+
+def _compile_edge_cleaner(string_keys: Tuple[str, ...], int_keys: Tuple[str, ...],
+                          bool_keys: Tuple[str, ...]):
+    """
+    Build _clean_edge_attrs with the edge schema unrolled into straight-line code
+    (the way dataclasses generates __init__): no per-edge loops over key tuples.
+    """
+    body = [
+        "def _clean_edge_attrs(raw):",
+        "    g = raw.get",
+        "    src = g('src') or g('src_openalex')",
+        "    dst = g('dst') or g('dst_openalex')",
+        "    if not src or not dst:",
+        "        return None, None, None",
+        # normalize S2-only endpoints if present in your graph as S2:... ids
+        # (slice compares; OpenAlex "W..." ids, the common case, stop at the first test)
+        "    if src[0] != 'W' and src[:3] != 'S2:' and g('src_s2'):",
+        "        src = 'S2:' + raw['src_s2']",
+        "    if dst[0] != 'W' and dst[:3] != 'S2:' and g('dst_s2'):",
+        "        dst = 'S2:' + raw['dst_s2']",
+        "    attrs = {}",
+    ]
+    for k in string_keys:
+        body.append(f"    if {k!r} in raw: attrs[{k!r}] = _as_str(raw[{k!r}])")
+    for k in int_keys:
+        body.append(f"    attrs[{k!r}] = _as_int(g({k!r}))")
+    for k in bool_keys:
+        body.append(f"    attrs[{k!r}] = _as_bool(g({k!r}))")
+    body.append("    return src, dst, attrs")
+    ns = {"_as_str": _as_str, "_as_int": _as_int, "_as_bool": _as_bool}
+    exec("\n".join(body), ns)
+    fn = ns["_clean_edge_attrs"]
+    fn.__doc__ = "Return (src, dst, attrs) with safe types; skip edges with missing endpoints."
+    return fn
+
+_clean_edge_attrs = _compile_edge_cleaner(GRAPHML_EDGE_STRING_KEYS, GRAPHML_EDGE_INT_KEYS, GRAPHML_EDGE_BOOL_KEYS)
+
+GRAPHML_NS = "http://graphml.graphdrawing.org/xmlns"
+XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+
+def _stream_graphml(f, node_attrs: Dict[str, dict], edge_attrs: Dict[Tuple[str, str], dict], etree) -> None:
+    """Incrementally write cleaned nodes/edges as GraphML with lxml.etree.xmlfile."""
+    def tag(name: str) -> str:
+        return f"{{{GRAPHML_NS}}}{name}"
+
+    def gml_type(v) -> str:
+        return "boolean" if isinstance(v, bool) else "long" if isinstance(v, int) else "string"
+
+    def gml_text(v) -> str:
+        return ("true" if v else "false") if isinstance(v, bool) else str(v)
+
+    # <key> declarations for every attribute that occurs, typed from its first value
+    key_ids: Dict[Tuple[str, str], str] = {}
+    decls = []
+    for domain, rows in (("node", node_attrs.values()), ("edge", edge_attrs.values())):
+        for attrs in rows:
+            for name, v in attrs.items():
+                if (domain, name) not in key_ids:
+                    key_ids[(domain, name)] = kid = f"d{len(key_ids)}"
+                    decls.append({"id": kid, "for": domain, "attr.name": name, "attr.type": gml_type(v)})
+    node_keys = {name: kid for (domain, name), kid in key_ids.items() if domain == "node"}
+    edge_keys = {name: kid for (domain, name), kid in key_ids.items() if domain == "edge"}
+
+    node_tag, edge_tag, data_tag = tag("node"), tag("edge"), tag("data")
+    with etree.xmlfile(f, encoding="utf-8") as xf:
+        xf.write_declaration()
+        root_attrs = {f"{{{XSI_NS}}}schemaLocation": f"{GRAPHML_NS} {GRAPHML_NS}/1.0/graphml.xsd"}
+        with xf.element(tag("graphml"), root_attrs, nsmap={None: GRAPHML_NS, "xsi": XSI_NS}):
+            for d in decls:
+                with xf.element(tag("key"), d):
+                    pass
+            with xf.element(tag("graph"), edgedefault="directed"):
+                for nid, attrs in node_attrs.items():
+                    with xf.element(node_tag, id=nid):
+                        for name, v in attrs.items():
+                            with xf.element(data_tag, key=node_keys[name]):
+                                xf.write(gml_text(v))
+                for (src, dst), attrs in edge_attrs.items():
+                    with xf.element(edge_tag, source=src, target=dst):
+                        for name, v in attrs.items():
+                            with xf.element(data_tag, key=edge_keys[name]):
+                                xf.write(gml_text(v))
+
+
+_IGRAPH_ID_RE = re.compile(r'\b(id|source|target)="n(\d+)"')
+
+
+def _rewrite_igraph_node_ids(src_path: str, out_path: str, ids: List[str]) -> None:
+    """Copy igraph's GraphML, replacing its positional n<i> node ids with ids[i]."""
+    from xml.sax.saxutils import quoteattr
+
+    def sub(m):
+        return f"{m.group(1)}={quoteattr(ids[int(m.group(2))])}"
+
+    with open(src_path, "r", encoding="utf-8") as fin, \
+            open(out_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as fout:
+        for line in fin:
+            # Only element tags carry node refs; <data> text is left untouched
+            head = line.lstrip()
+            if head.startswith("<node ") or head.startswith("<edge "):
+                line = _IGRAPH_ID_RE.sub(sub, line)
+            fout.write(line)
+
 
 def write_graphml(nodes, edges, out_path):
     """
     Write a GraphML file that tools like Gephi/Cytoscape can ingest.
     GraphML is strict: no None values and consistent types per attribute.
     This function coerces/filters attributes to keep the writer happy.
+    Streams XML with lxml when installed, else uses python-igraph's C writer,
+    else falls back to networkx; all three emit the work ids as node ids.
     """
-    import logging, networkx as nx
-
     log = logging.getLogger(__name__)
 
-    # --- Define which attributes exist and what types they should be ---
-    STRING_KEYS = {
-        "id", "openalex_id", "s2_id", "doi", "title", "host_venue",
-        "type", "authors", "source",
-    }
-    INT_KEYS = {"publication_year", "cited_by_count"}
-    BOOL_KEYS = {"is_retracted"}
-
-    EDGE_STRING_KEYS = set()   # if you ever add string edge attrs
-    EDGE_INT_KEYS = {"depth"}  # current schema
-    EDGE_BOOL_KEYS = set()
-
-    # Helpers
-    def _as_str(v):
-        if v is None:
-            return ""
-        # forbid lists/dicts in GraphML
-        if isinstance(v, (list, dict)):
-            return ""
-        return str(v)
-
-    def _as_int(v):
-        if v is None or v == "":
-            return -1
-        try:
-            return int(v)
-        except Exception:
-            # last-resort: if it can't be parsed, mark as -1
-            return -1
-
-    def _as_bool(v):
-        if v is None:
-            return False
-        if isinstance(v, bool):
-            return v
-        # accept "true"/"false", "1"/"0"
-        s = str(v).strip().lower()
-        if s in {"1", "true", "yes", "y"}:
-            return True
-        if s in {"0", "false", "no", "n"}:
-            return False
-        return False
-
-    def _clean_node_attrs(raw):
-        """
-        Return (node_id, attrs) with safe GraphML-friendly values.
-        If node id can't be determined, return (None, None) to skip.
-        """
-        # pick a stable id
-        nid = (
-            raw.get("id")
-            or raw.get("openalex_id")
-            or (("S2:" + raw["s2_id"]) if raw.get("s2_id") else None)
-        )
-        if not nid:
-            return None, None
-
-        attrs = {}
-        # strings
-        for k in STRING_KEYS:
-            if k in raw:
-                attrs[k] = _as_str(raw.get(k))
-        # ints
-        for k in INT_KEYS:
-            if k in raw:
-                attrs[k] = _as_int(raw.get(k))
-            else:
-                # ensure consistent type across nodes
-                attrs[k] = -1
-        # bools
-        for k in BOOL_KEYS:
-            if k in raw:
-                attrs[k] = _as_bool(raw.get(k))
-            else:
-                attrs[k] = False
-
-        # Drop any unknown keys or complex types to avoid type conflicts
-        return nid, attrs
-
-    def _clean_edge_attrs(raw):
-        """
-        Return (src, dst, attrs) with safe types; skip edges with missing endpoints.
-        """
-        src = raw.get("src") or raw.get("src_openalex")
-        dst = raw.get("dst") or raw.get("dst_openalex")
-        if not src or not dst:
-            return None, None, None
-
-        # normalize S2-only endpoints if present in your graph as S2:... ids
-        if src.startswith("W") is False and raw.get("src_s2") and not src.startswith("S2:"):
-            src = "S2:" + raw["src_s2"]
-        if dst.startswith("W") is False and raw.get("dst_s2") and not dst.startswith("S2:"):
-            dst = "S2:" + raw["dst_s2"]
-
-        attrs = {}
-        for k in EDGE_STRING_KEYS:
-            if k in raw:
-                attrs[k] = _as_str(raw.get(k))
-        for k in EDGE_INT_KEYS:
-            if k in raw:
-                attrs[k] = _as_int(raw.get(k))
-            else:
-                attrs[k] = -1
-        for k in EDGE_BOOL_KEYS:
-            if k in raw:
-                attrs[k] = _as_bool(raw.get(k))
-            else:
-                attrs[k] = False
-        return src, dst, attrs
-
-    # Build a DiGraph (GraphML supports directed edges)
-    G = nx.DiGraph()
-
-    # (Optional) Graph-level metadata – must be strings/bools/ints only
-    # If you have a global meta dict, coerce here similarly (no None!)
-    # Example:
-    # G.graph["seed"] = _as_str(meta.get("seed", ""))
-    # G.graph["generated_at"] = _as_str(meta.get("generated_at", ""))
-
-    # Add nodes
+    # Clean once up front; both writers below only consume these.
+    # Repeated ids/edges merge their attrs, as nx.DiGraph.add_node/add_edge do.
+    node_attrs: Dict[str, dict] = {}
     skipped_nodes = 0
     for n in nodes:
         nid, attrs = _clean_node_attrs(n)
         if nid is None:
             skipped_nodes += 1
             continue
-        G.add_node(nid, **attrs)
+        node_attrs.setdefault(nid, {}).update(attrs)
     if skipped_nodes:
         log.debug("GraphML: skipped %d nodes with no usable id", skipped_nodes)
 
-    # Add edges
+    edge_attrs: Dict[Tuple[str, str], dict] = {}
     skipped_edges = 0
     for e in edges:
         src, dst, attrs = _clean_edge_attrs(e)
         if src is None or dst is None:
             skipped_edges += 1
             continue
-        G.add_edge(src, dst, **attrs)
+        edge_attrs.setdefault((src, dst), {}).update(attrs)
     if skipped_edges:
         log.debug("GraphML: skipped %d edges with missing endpoints", skipped_edges)
 
-    # Finally, write GraphML. If lxml is installed, NetworkX will use it automatically.
+    # Edge endpoints that weren't in `nodes` still need a <node> (no data)
+    for src, dst in edge_attrs:
+        node_attrs.setdefault(src, {})
+        node_attrs.setdefault(dst, {})
+
     try:
-        nx.write_graphml(G, out_path)
+        import igraph as ig
+    except ImportError:
+        ig = None
+    try:
+        from lxml import etree
+    except ImportError:
+        etree = None
+
+    try:
+        if etree is not None:
+            # Stream elements straight to the file: no DiGraph, no in-memory XML tree
+            with open(out_path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+                _stream_graphml(f, node_attrs, edge_attrs, etree)
+        elif ig is not None:
+            # igraph writes in C; it needs a value for every attribute
+            # (it would print None as "None"), so fill defaults.
+            ids = list(node_attrs)
+            index = {nid: i for i, nid in enumerate(ids)}
+            g = ig.Graph(n=len(ids), edges=[(index[s], index[t]) for s, t in edge_attrs], directed=True)
+            rows = list(node_attrs.values())
+            for k in GRAPHML_STRING_KEYS[1:]:  # "id" is set below
+                if any(k in r for r in rows):
+                    g.vs[k] = [r.get(k, "") for r in rows]
+            for k in GRAPHML_INT_KEYS:
+                g.vs[k] = [r.get(k, -1) for r in rows]
+            for k in GRAPHML_BOOL_KEYS:
+                g.vs[k] = [r.get(k, False) for r in rows]
+            g.vs["id"] = ids
+            erows = list(edge_attrs.values())
+            for keys, default in ((GRAPHML_EDGE_STRING_KEYS, ""), (GRAPHML_EDGE_INT_KEYS, -1),
+                                  (GRAPHML_EDGE_BOOL_KEYS, False)):
+                for k in keys:
+                    g.es[k] = [r.get(k, default) for r in erows]
+            # igraph names the XML nodes n0, n1, ...; swap our ids back in so
+            # every writer emits the same node ids.
+            tmp = f"{out_path}.tmp"
+            g.write_graphml(tmp)
+            _rewrite_igraph_node_ids(tmp, out_path, ids)
+            os.remove(tmp)
+        else:
+            import networkx as nx
+
+            # Build a DiGraph (GraphML supports directed edges)
+            G = nx.DiGraph()
+
+            # (Optional) Graph-level metadata – must be strings/bools/ints only
+            # If you have a global meta dict, coerce here similarly (no None!)
+            # Example:
+            # G.graph["seed"] = _as_str(meta.get("seed", ""))
+            # G.graph["generated_at"] = _as_str(meta.get("generated_at", ""))
+
+            G.add_nodes_from(node_attrs.items())
+            G.add_edges_from((s, t, attrs) for (s, t), attrs in edge_attrs.items())
+
+            # No prettyprint: indentation only bloats a file that tools parse anyway.
+            with open(out_path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+                nx.write_graphml_xml(G, f, prettyprint=False)
     except Exception as ex:
         # Last-resort diagnostics: tell the user what to fix.
         log.error("Failed to write GraphML to %s: %s", out_path, ex)
@@ -1000,6 +1818,55 @@ def write_graphml(nodes, edges, out_path):
         raise
 
 
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _fr_step(pos, disp, src, dst, k, t):
+        """One Fruchterman–Reingold step (same force law as nx.spring_layout), in place."""
+        n = pos.shape[0]
+        for i in prange(n):
+            dx = 0.0
+            dy = 0.0
+            for j in range(n):
+                if i != j:
+                    ddx = pos[i, 0] - pos[j, 0]
+                    ddy = pos[i, 1] - pos[j, 1]
+                    f = k * k / max(ddx * ddx + ddy * ddy, 1e-4)
+                    dx += ddx * f
+                    dy += ddy * f
+            disp[i, 0] = dx
+            disp[i, 1] = dy
+        # Attraction runs serially: edges share endpoints
+        for e in range(src.shape[0]):
+            a = src[e]
+            b = dst[e]
+            ddx = pos[a, 0] - pos[b, 0]
+            ddy = pos[a, 1] - pos[b, 1]
+            f = np.sqrt(ddx * ddx + ddy * ddy) / k
+            disp[a, 0] -= ddx * f
+            disp[a, 1] -= ddy * f
+            disp[b, 0] += ddx * f
+            disp[b, 1] += ddy * f
+        for i in prange(n):
+            step = t / max(np.sqrt(disp[i, 0] * disp[i, 0] + disp[i, 1] * disp[i, 1]), 0.01)
+            pos[i, 0] += disp[i, 0] * step
+            pos[i, 1] += disp[i, 1] * step
+
+def _fr_layout(keys: List[str], edges: List[Tuple[str, str]], k: float, iterations: int = 50,
+               seed: int = 42) -> Dict[str, Any]:
+    """Numba force-directed layout on flat float32/int32 arrays; {key: (x, y)}."""
+    index = {key: i for i, key in enumerate(keys)}
+    pairs = [(index[s], index[t]) for s, t in edges if s in index and t in index and s != t]
+    src = np.array([a for a, _ in pairs], dtype=np.int32)
+    dst = np.array([b for _, b in pairs], dtype=np.int32)
+    pos = np.random.default_rng(seed).random((len(keys), 2), dtype=np.float32)
+    disp = np.empty_like(pos)
+    t = 0.1
+    dt = t / (iterations + 1)
+    for _ in range(iterations):
+        _fr_step(pos, disp, src, dst, np.float32(k), np.float32(t))
+        t -= dt
+    return dict(zip(keys, pos))
+
 def quick_plot(nodes: Dict[str, WorkNode], edges: List[Tuple[str, str]], out_path: str):
     try:
         import networkx as nx
@@ -1013,7 +1880,10 @@ def quick_plot(nodes: Dict[str, WorkNode], edges: List[Tuple[str, str]], out_pat
     for s, t in edges:
         G.add_edge(s, t)
     plt.figure(figsize=(10, 10))
-    pos = nx.spring_layout(G, k=0.4, seed=42)
+    if njit is not None and np is not None:
+        pos = _fr_layout(list(G.nodes), edges, k=0.4)
+    else:
+        pos = nx.spring_layout(G, k=0.4, seed=42)
     nx.draw_networkx_nodes(G, pos, node_size=40)
     nx.draw_networkx_edges(G, pos, arrows=False, width=0.5)
     ranked = sorted(nodes.items(), key=lambda kv: (kv[1].cited_by_count or 0), reverse=True)[:10]
@@ -1038,9 +1908,12 @@ def main():
     ap.add_argument("-d", "--depth", type=int, default=2, help="Reference depth (default: 2)")
     ap.add_argument("--email", default=os.getenv("OPENALEX_EMAIL"), help="Contact email for OpenAlex polite usage")
     ap.add_argument("--delay", type=float, default=0.2, help="Delay between BFS layers (seconds)")
-    ap.add_argument("--cache", default=".openalex_cache.json", help="Path to JSON cache for OpenAlex ('' to disable)")
+    ap.add_argument("--cache", default=".openalex_cache.sqlite",
+                    help="Path to the OpenAlex work cache (SQLite; a .json path uses its .sqlite sibling; '' to disable)")
     ap.add_argument("--outprefix", default="sources", help="Prefix for output files")
-    ap.add_argument("--graphml", action="store_true", help="Also write GraphML (requires networkx)")
+    ap.add_argument("--graphml", action="store_true", help="Also write GraphML (uses lxml if installed, else python-igraph, else networkx)")
+    ap.add_argument("--parquet", action="store_true",
+                    help="Also write <outprefix>_nodes.parquet / _edges.parquet (requires pyarrow)")
     ap.add_argument("--plot", action="store_true", help="Also write quick PNG plot (requires networkx + matplotlib)")
     ap.add_argument("--source", choices=["auto", "openalex", "s2"], default="auto",
                     help="Reference expansion source: OpenAlex only, SemanticScholar (s2), or auto fallback")
@@ -1062,6 +1935,12 @@ def main():
     # New: rate limiter & mapping cache path
     ap.add_argument("--oa-qps", type=float, default=3.0, help="Polite OpenAlex requests-per-second cap (default: 3.0)")
     ap.add_argument("--map-cache-path", default=".map_cache.json", help="Path to persistent S2→OA mapping cache")
+    ap.add_argument("--http2", action="store_true",
+                    help="Use HTTP/2 (httpx) so worker requests share one multiplexed connection per API "
+                         "(requires `pip install 'httpx[http2]'`)")
+    ap.add_argument("--bloom-seen", type=int, default=0, metavar="N",
+                    help="Track visited nodes in a Bloom filter sized for N keys instead of an exact set "
+                         "(0.1%% of nodes may go unexpanded; requires `pip install rbloom`)")
 
     args = ap.parse_args()
 
@@ -1087,14 +1966,23 @@ def main():
     cache_path = args.cache if args.cache else None
 
     # Configure rate limiter
-    global _OA_QPS
+    global _OA_QPS, _OA_LIMITER
     _OA_QPS = float(args.oa_qps) if args.oa_qps and args.oa_qps > 0 else 3.0
+    _OA_LIMITER = _make_oa_limiter(_OA_QPS)
     logger.info(f"OpenAlex QPS cap set to {_OA_QPS:.2f}")
+    if args.email:
+        OA_PARAMS["mailto"] = args.email
+
+    if args.http2 and not _enable_http2():
+        logger.warning("--http2 requested but httpx[http2] is not installed; using requests (HTTP/1.1).")
+    if args.bloom_seen and Bloom is None:
+        logger.warning("--bloom-seen requested but rbloom is not installed; using an exact set.")
 
     # Load mapping cache
     global _MAP_CACHE_PATH
     _MAP_CACHE_PATH = args.map_cache_path
     _load_map_cache(_MAP_CACHE_PATH)
+    atexit.register(_flush_map_cache, _MAP_CACHE_PATH, True)
 
     # Wall clock start
     t_start = perf_counter()
@@ -1140,7 +2028,8 @@ def main():
             strict_threshold=args.strict_threshold,
             logger=logger,
             progress=args.progress,
-            map_cache_path=_MAP_CACHE_PATH
+            map_cache_path=_MAP_CACHE_PATH,
+            bloom_capacity=args.bloom_seen,
         )
     else:
         print(f"[info] Seed OA: {seed_oa} | Using OpenAlex-only (found {oa_ref_count} OA references on seed)")
@@ -1155,23 +2044,39 @@ def main():
             prune_below=args.prune_below_threshold,
             strict_threshold=args.strict_threshold,
             logger=logger,
-            progress=args.progress
+            progress=args.progress,
+            bloom_capacity=args.bloom_seen,
         )
 
     # Write outputs
     node_csv = f"{args.outprefix}_nodes.csv"
     edge_csv = f"{args.outprefix}_edges.csv"
     json_out = "graph.json"
-    write_csv_nodes(nodes, node_csv)
-    write_csv_edges(edges, edge_csv)
-    write_json(nodes, edges, json_out)
-    print(f"[done] Wrote {len(nodes)} nodes → {node_csv}")
-    print(f"[done] Wrote {len(edges)} edges → {edge_csv}")
-    print(f"[done] Wrote JSON graph → {json_out}")
+    node_pq = f"{args.outprefix}_nodes.parquet"
+    edge_pq = f"{args.outprefix}_edges.parquet"
+    # Independent files: encode one while another is being written back by the OS
+    # (pyarrow also releases the GIL). GraphML/PNG stay sequential below.
+    with ThreadPoolExecutor(max_workers=2) as wex:
+        futs = [
+            wex.submit(write_nodes_csv_and_json, nodes, edges, node_csv, json_out),
+            wex.submit(write_csv_edges, edges, edge_csv),
+        ]
+        pq_fut = wex.submit(write_parquet, nodes, edges, node_pq, edge_pq) if args.parquet else None
+        for fut in futs:
+            fut.result()
+        print(f"[done] Wrote {len(nodes)} nodes → {node_csv}")
+        print(f"[done] Wrote {len(edges)} edges → {edge_csv}")
+        print(f"[done] Wrote JSON graph → {json_out}")
+        if pq_fut is not None and pq_fut.result():
+            print(f"[done] Wrote Parquet → {node_pq}, {edge_pq}")
 
     if args.graphml:
         graphml = "graph.graphml"
-        write_graphml(nodes, edges, graphml)
+        write_graphml(
+            [{"id": k, **n.to_dict()} for k, n in nodes.items()],
+            [{"src": s, "dst": t} for s, t in edges],
+            graphml,
+        )
         print(f"[done] Wrote GraphML → {graphml}")
     if args.plot:
         png = "graph.png"
@@ -1184,15 +2089,14 @@ def main():
         _METRICS["wall_clock_seconds"] = wall
 
     # Metrics summary
-    with _METRICS_LOCK:
-        m = json.loads(json.dumps(_METRICS))  # shallow copy
+    m = _snapshot_metrics()
 
     for bucket in ("openalex", "s2"):
-        lat = m["requests"][bucket]["latencies"]
-        if lat:
+        lat = m["requests"][bucket]["latency"]
+        if lat["count"]:
             logging.info(
                 f"[metrics] {bucket} ok={m['requests'][bucket]['ok']} err={m['requests'][bucket]['err']} "
-                f"avg={mean(lat):.3f}s p50={_percentile(lat,50):.3f}s p95={_percentile(lat,95):.3f}s"
+                f"avg={lat['mean']:.3f}s p50={lat['p50']:.3f}s p95={lat['p95']:.3f}s"
             )
         else:
             logging.info(f"[metrics] {bucket} ok={m['requests'][bucket]['ok']} err={m['requests'][bucket]['err']}")
@@ -1208,12 +2112,17 @@ def main():
                 f"rps={rps} eff_parallelism≈{ep}"
             )
 
+    for c in m["cache_loads"]:
+        logging.info(
+            f"[metrics] {c['cache']} cache {c['path']}: {c['bytes'] / 1e6:.1f} MB, "
+            f"{c['entries']} entries parsed in {c['seconds']:.3f}s"
+        )
+
     logging.info(f"[metrics] wall_clock_seconds={wall:.2f}")
 
     if args.metrics_out:
         try:
-            with open(args.metrics_out, "w", encoding="utf-8") as f:
-                json.dump(m, f, ensure_ascii=False, indent=2)
+            _dump_json_atomic(m, args.metrics_out, indent=True)
             logging.info(f"[metrics] wrote → {args.metrics_out}")
         except Exception as e:
             logging.warning(f"[metrics] failed to write {args.metrics_out}: {e}")